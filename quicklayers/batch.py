@@ -0,0 +1,401 @@
+"""Audit and migrate Quick Layers bindings in QGIS project files without starting QGIS.
+
+Bindings are read from the 'quick_layers' element written by
+QuickLayersWidget.project_save. Usage:
+
+    python -m quicklayers.batch audit projects/*.qgz
+    python -m quicklayers.batch export projects/*.qgs --output-dir bindings/
+    python -m quicklayers.batch import bindings.json projects/*.qgz
+"""
+
+# Project
+from quicklayers.__about__ import __title__, __version__
+
+# Standard
+from argparse import ArgumentParser, ArgumentTypeError
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+import json
+import os
+import shutil
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+import xml.parsers.expat
+import zipfile
+
+
+@contextmanager
+def open_project_xml(path: Path):
+    """Open the project XML of a .qgs file, or of the .qgs stored inside a .qgz archive."""
+
+    if path.suffix.lower() == '.qgz':
+        with zipfile.ZipFile(path) as archive, archive.open(qgz_member_name(archive)) as f:
+            yield f
+
+    else:
+        with open(path, 'rb') as f:
+            yield f
+
+
+def qgz_member_name(archive: zipfile.ZipFile) -> str:
+
+    for name in archive.namelist():
+        if name.lower().endswith('.qgs'):
+            return name
+
+    raise ValueError(f"No .qgs file found in '{archive.filename}'")
+
+
+def read_project(path: Path) -> Dict:
+    """Stream through a project file and collect its bindings and map layer names.
+
+    Elements are cleared once parsed, so memory use does not grow with the size of
+    the project.
+    """
+
+    bindings = []
+    map_lyr_names = set()
+
+    tags = []
+
+    with open_project_xml(path) as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+
+            if event == 'start':
+                tags.append(elem.tag)
+                continue
+
+            tags.pop()
+
+            # <maplayer><layername>...</layername></maplayer>
+            if elem.tag == 'layername' and tags and tags[-1] == 'maplayer':
+                map_lyr_names.add(elem.text or '')
+
+            # <qgis><quick_layers><layer_shortcut><layer_shortcut .../>
+            elif elem.tag == 'layer_shortcut' and tags[-2:] == ['quick_layers', 'layer_shortcut']:
+                bindings.append({
+                    'map_lyr_name': elem.get('map_lyr', 'None'),
+                    'shortcut_str': elem.get('shortcut', 'None'),
+                })
+
+            # Free top-level sections and map layers once they have been read
+            if len(tags) <= 2:
+                elem.clear()
+
+    return {
+        'bindings': bindings,
+        'map_lyr_names': map_lyr_names,
+    }
+
+
+def audit_project(path: Path) -> Dict:
+    """Report bindings, bindings whose layer name is not in the project and shortcut conflicts.
+
+    Bindings without a layer are saved with the layer name 'None' and are reported as
+    unbound rather than unresolved.
+    """
+
+    project = read_project(path)
+    bindings = project['bindings']
+
+    unbound = [
+        binding['shortcut_str'] for binding in bindings
+        if binding['map_lyr_name'] == 'None'
+    ]
+
+    unresolved = [
+        binding['map_lyr_name'] for binding in bindings
+        if binding['map_lyr_name'] != 'None' and binding['map_lyr_name'] not in project['map_lyr_names']
+    ]
+
+    map_lyr_names_by_shortcut = {}
+    for binding in bindings:
+        if binding['shortcut_str'] != 'None':
+            map_lyr_names_by_shortcut.setdefault(binding['shortcut_str'], []).append(binding['map_lyr_name'])
+
+    conflicts = {
+        shortcut_str: map_lyr_names
+        for shortcut_str, map_lyr_names in map_lyr_names_by_shortcut.items()
+        if len(map_lyr_names) > 1
+    }
+
+    return {
+        'path': str(path),
+        'bindings': bindings,
+        'unbound': unbound,
+        'unresolved': unresolved,
+        'conflicts': conflicts,
+    }
+
+
+def export_json_path(path: Path, output_dir: Path = None) -> Path:
+
+    return (output_dir or path.parent) / f"{path.stem}.json"
+
+
+def export_project(path: Path, output_dir: Path = None) -> Dict:
+    """Write a project's bindings to a JSON file readable by LayerShortcutTableModel.from_json."""
+
+    bindings = read_project(path)['bindings']
+
+    json_path = export_json_path(path, output_dir)
+
+    with open(json_path, 'w') as outfile:
+        outfile.write(json.dumps(bindings, indent=4))
+
+    return {
+        'path': str(path),
+        'json_path': str(json_path),
+        'bindings': len(bindings),
+    }
+
+
+def load_bindings(json_path: Path) -> List[Dict]:
+    """Read bindings from a JSON file written by to_json or export.
+
+    Raises:
+        ValueError: if the file is not a list of bindings with string values
+    """
+
+    with open(json_path) as f:
+        bindings = json.load(f)
+
+    if not isinstance(bindings, list):
+        raise ValueError(f"'{json_path}' does not contain a list of bindings")
+
+    for i, binding in enumerate(bindings):
+        if not isinstance(binding, dict) or not all(
+            isinstance(binding.get(key), str) for key in ('map_lyr_name', 'shortcut_str')
+        ):
+            raise ValueError(f"Binding {i} of '{json_path}' needs string 'map_lyr_name' and 'shortcut_str' values")
+
+    return bindings
+
+
+def import_project(path: Path, bindings: List[Dict]) -> Dict:
+    """Replace a project's bindings with the given ones, as returned by load_bindings."""
+
+    if path.suffix.lower() == '.qgz':
+        with zipfile.ZipFile(path) as archive:
+            member_name = qgz_member_name(archive)
+            data = set_project_bindings(archive.read(member_name), bindings)
+
+            # Rewrite the archive, keeping every other member as is
+            def write_qgz(f):
+                with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as out_archive:
+                    for info in archive.infolist():
+                        if info.filename == member_name:
+                            out_archive.writestr(info, data)
+                        else:
+                            out_archive.writestr(info, archive.read(info.filename))
+
+            replace_file(path, write_qgz)
+
+    else:
+        with open(path, 'rb') as f:
+            data = set_project_bindings(f.read(), bindings)
+
+        replace_file(path, lambda f: f.write(data))
+
+    return {
+        'path': str(path),
+        'bindings': len(bindings),
+    }
+
+
+def replace_file(path: Path, write) -> None:
+    """Write a file next to path with write(f), then move it over path.
+
+    The original file is left untouched if anything goes wrong while writing.
+    """
+
+    fd, tmp_path = tempfile.mkstemp(suffix=path.suffix, dir=path.parent)
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def set_project_bindings(data: bytes, bindings: List[Dict]) -> bytes:
+    """Return project XML with its 'quick_layers' element replaced by the given bindings."""
+
+    root = ET.fromstring(data)
+
+    if root.tag != 'qgis':
+        raise ValueError(f"Root element is '{root.tag}', not 'qgis'")
+
+    for plugin_elem in root.findall('quick_layers'):
+        root.remove(plugin_elem)
+
+    # Same layout as QuickLayersWidget.project_save
+    if len(bindings) > 0:
+        plugin_elem = ET.SubElement(root, 'quick_layers')
+        layer_shortcuts_elem = ET.SubElement(plugin_elem, 'layer_shortcut')
+
+        for binding in bindings:
+            ET.SubElement(layer_shortcuts_elem, 'layer_shortcut', {
+                'map_lyr': binding['map_lyr_name'],
+                'shortcut': binding['shortcut_str'],
+            })
+
+    # ElementTree drops the XML declaration and DOCTYPE, so keep the original ones
+    prolog = data[:root_start(data)]
+
+    return prolog + ET.tostring(root, encoding='utf-8', xml_declaration=False)
+
+
+class RootFound(Exception):
+    pass
+
+
+def root_start(data: bytes) -> int:
+    """Return the byte offset of the root element's start tag."""
+
+    parser = xml.parsers.expat.ParserCreate()
+
+    def start_element(name, attrs):
+        raise RootFound(parser.CurrentByteIndex)
+
+    parser.StartElementHandler = start_element
+
+    try:
+        parser.Parse(data, True)
+    except RootFound as e:
+        return e.args[0]
+
+    raise ValueError("No root element found")
+
+
+def run_parallel(func, paths: List[Path], jobs: int, **kwargs) -> List[Dict]:
+    """Apply func to every project file, using a process pool when there is more than one."""
+
+    if jobs == 1 or len(paths) == 1:
+        return [run_safe(func, path, kwargs) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_safe, func, path, kwargs) for path in paths]
+        return [future.result() for future in futures]
+
+
+def run_safe(func, path: Path, kwargs: Dict) -> Dict:
+
+    # One unreadable project should not abort the whole batch
+    try:
+        return func(path, **kwargs)
+    except (OSError, ET.ParseError, zipfile.BadZipFile, ValueError, KeyError) as e:
+        return {
+            'path': str(path),
+            'error': str(e),
+        }
+
+
+def print_audit(result: Dict) -> None:
+
+    print(result['path'])
+    print(f"  {len(result['bindings'])} binding(s)")
+
+    for binding in result['bindings']:
+        print(f"    {binding['shortcut_str']:<20} {binding['map_lyr_name']}")
+
+    for shortcut_str in result['unbound']:
+        print(f"  Unbound shortcut: '{shortcut_str}' has no layer")
+
+    for map_lyr_name in result['unresolved']:
+        print(f"  Unresolved layer: '{map_lyr_name}'")
+
+    for shortcut_str, map_lyr_names in result['conflicts'].items():
+        print(f"  Key conflict: '{shortcut_str}' is used by {', '.join(map_lyr_names)}")
+
+
+def positive_int(value: str) -> int:
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid int value: '{value}'")
+
+    if value < 1:
+        raise ArgumentTypeError(f"must be at least 1, got {value}")
+
+    return value
+
+
+def main(args: List[str] = None) -> int:
+
+    parser = ArgumentParser(prog='python -m quicklayers.batch', description=f"{__title__} {__version__} batch tool")
+    parser.add_argument('-j', '--jobs', type=positive_int, default=os.cpu_count(), help="Number of worker processes")
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    audit_parser = subparsers.add_parser('audit', help="Report bindings, unresolved layers and key conflicts")
+    audit_parser.add_argument('projects', nargs='+', type=Path)
+    audit_parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    export_parser = subparsers.add_parser('export', help="Write each project's bindings to a JSON file")
+    export_parser.add_argument('projects', nargs='+', type=Path)
+    export_parser.add_argument('-o', '--output-dir', type=Path, help="Defaults to each project's folder")
+
+    import_parser = subparsers.add_parser('import', help="Replace each project's bindings with a JSON file")
+    import_parser.add_argument('json_path', type=Path)
+    import_parser.add_argument('projects', nargs='+', type=Path)
+
+    args = parser.parse_args(args)
+
+    if args.command == 'audit':
+        results = run_parallel(audit_project, args.projects, args.jobs)
+
+    elif args.command == 'export':
+        # Parallel workers must not write to the same JSON file
+        json_path_counts = Counter(export_json_path(path, args.output_dir) for path in args.projects)
+        duplicates = sorted(str(json_path) for json_path, count in json_path_counts.items() if count > 1)
+        if duplicates:
+            parser.error(f"several projects would be exported to {', '.join(duplicates)}")
+
+        results = run_parallel(export_project, args.projects, args.jobs, output_dir=args.output_dir)
+
+    else:
+        # Check the bindings once, before any project is rewritten
+        try:
+            bindings = load_bindings(args.json_path)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+        results = run_parallel(import_project, args.projects, args.jobs, bindings=bindings)
+
+    errors = [result for result in results if 'error' in result]
+
+    if args.command == 'audit' and args.json:
+        print(json.dumps(results, indent=4))
+
+    else:
+        for result in results:
+            if 'error' in result:
+                print(f"{result['path']}\n  Error: {result['error']}", file=sys.stderr)
+            elif args.command == 'audit':
+                print_audit(result)
+            elif args.command == 'export':
+                print(f"{result['path']}: {result['bindings']} binding(s) written to {result['json_path']}")
+            else:
+                print(f"{result['path']}: {result['bindings']} binding(s) imported")
+
+    # Non-zero exit status when something needs attention, e.g. for CI checks
+    if errors:
+        return 2
+    if args.command == 'audit' and any(result['unresolved'] or result['conflicts'] for result in results):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# Misc
+from typing import Optional, Tuple
+
+
+def fuzzy_score(text: str, name: str) -> Optional[Tuple[int, int]]:
+    """Score how well text matches name, lower is better, or None if it does not match.
+
+    Names containing text as-is come first, earliest match first. Otherwise the
+    characters of text must appear in order in name, and tighter matches score better.
+    """
+
+    start = name.find(text)
+    if start >= 0:
+        return (0, start)
+
+    pos = name.find(text[0])
+    if pos < 0:
+        return None
+
+    first = pos
+    for char in text[1:]:
+        pos = name.find(char, pos + 1)
+        if pos < 0:
+            return None
+
+    return (1, len(name) + pos - first)
@@ -0,0 +1,193 @@
+# Project
+from quicklayers.fuzzy_search import fuzzy_score
+from quicklayers.layer_shortcut import toggle_map_lyr
+from quicklayers.__about__ import __title__
+
+# Misc
+from typing import List
+import heapq
+import itertools
+
+# qgis
+from qgis.gui import QgsFilterLineEdit
+from qgis.core import QgsProject, QgsMapLayer
+
+# PyQt
+from qgis.PyQt.QtCore import QObject, QEvent, Qt, pyqtSlot
+from qgis.PyQt.QtWidgets import QApplication, QDialog, QListWidget, QListWidgetItem, QVBoxLayout
+
+
+class LayerNameIndex(QObject):
+    """Lowercase names of every map layer in the project.
+
+    Built once, then updated as layers are added, removed or renamed, so that searching
+    does not need to go through the project's layers.
+    """
+
+    def __init__(self, parent, qgs_project: QgsProject):
+
+        super().__init__(parent)
+
+        self.qgs_project = qgs_project
+
+        # Layer ID -> (map layer, lowercase name)
+        self.map_lyrs = {}
+
+        # Last search, reused when the search string is extended
+        self.last_text = None
+        self.last_matches = []
+        self.generation = 0
+        self.last_generation = None
+
+        self.add_map_lyrs(list(qgs_project.mapLayers().values()))
+
+        self.qgs_project.layersAdded.connect(self.add_map_lyrs)
+        self.qgs_project.layersWillBeRemoved['QStringList'].connect(self.release_map_lyrs)
+        self.qgs_project.layersRemoved.connect(self.remove_map_lyrs)
+
+    def add_map_lyrs(self, map_lyrs: List[QgsMapLayer]) -> None:
+
+        for map_lyr in map_lyrs:
+            if map_lyr.id() not in self.map_lyrs:
+                map_lyr.nameChanged.connect(self.rename_map_lyr)
+
+            self.map_lyrs[map_lyr.id()] = (map_lyr, map_lyr.name().lower())
+
+        self.generation += 1
+
+    def release_map_lyrs(self, map_lyr_ids: List[str]) -> None:
+
+        # Disconnect while the layers are still alive, they may be deleted by layersRemoved
+        for map_lyr_id in map_lyr_ids:
+            if map_lyr_id in self.map_lyrs:
+                self.map_lyrs[map_lyr_id][0].nameChanged.disconnect(self.rename_map_lyr)
+
+    def remove_map_lyrs(self, map_lyr_ids: List[str]) -> None:
+
+        for map_lyr_id in map_lyr_ids:
+            self.map_lyrs.pop(map_lyr_id, None)
+
+        self.generation += 1
+
+    @pyqtSlot()
+    def rename_map_lyr(self) -> None:
+
+        map_lyr = self.sender()
+
+        if map_lyr.id() in self.map_lyrs:
+            self.map_lyrs[map_lyr.id()] = (map_lyr, map_lyr.name().lower())
+            self.generation += 1
+
+    def clean_up(self) -> None:
+
+        self.qgs_project.layersAdded.disconnect(self.add_map_lyrs)
+        self.qgs_project.layersWillBeRemoved['QStringList'].disconnect(self.release_map_lyrs)
+        self.qgs_project.layersRemoved.disconnect(self.remove_map_lyrs)
+
+        for map_lyr, name in self.map_lyrs.values():
+            map_lyr.nameChanged.disconnect(self.rename_map_lyr)
+
+        self.map_lyrs.clear()
+        self.last_text = None
+        self.last_matches = []
+
+    def search(self, text: str, limit: int) -> List[QgsMapLayer]:
+        """Return up to 'limit' map layers whose name fuzzy-matches text, best matches first."""
+
+        text = text.lower()
+
+        if not text:
+            return [map_lyr for map_lyr, name in itertools.islice(self.map_lyrs.values(), limit)]
+
+        # Typing more characters can only remove matches, so only look at the previous ones
+        if self.last_generation == self.generation and self.last_text and text.startswith(self.last_text):
+            candidate_ids = self.last_matches
+        else:
+            candidate_ids = self.map_lyrs.keys()
+
+        matches = []
+        for map_lyr_id in candidate_ids:
+            score = fuzzy_score(text, self.map_lyrs[map_lyr_id][1])
+            if score is not None:
+                matches.append((score, map_lyr_id))
+
+        self.last_text = text
+        self.last_matches = [map_lyr_id for score, map_lyr_id in matches]
+        self.last_generation = self.generation
+
+        return [self.map_lyrs[map_lyr_id][0] for score, map_lyr_id in heapq.nsmallest(limit, matches)]
+
+
+class LayerPaletteDialog(QDialog):
+
+    max_results = 50
+
+    def __init__(self, parent, layer_name_index: LayerNameIndex):
+
+        super().__init__(parent)
+
+        self.layer_name_index = layer_name_index
+
+        self.setWindowTitle(f"{__title__} - Toggle layer")
+        self.resize(400, 300)
+
+        self.search_line_edit = QgsFilterLineEdit(self)
+        self.search_line_edit.setShowSearchIcon(True)
+        self.search_line_edit.setPlaceholderText("Search layers")
+        self.search_line_edit.textChanged.connect(self.update_results)
+        self.search_line_edit.returnPressed.connect(self.toggle_current)
+        self.search_line_edit.installEventFilter(self)
+
+        self.results_list = QListWidget(self)
+        self.results_list.itemActivated.connect(self.toggle_item)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.search_line_edit)
+        layout.addWidget(self.results_list)
+
+    def open_palette(self) -> None:
+
+        self.search_line_edit.clear()
+        self.update_results('')
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.search_line_edit.setFocus()
+
+    def update_results(self, text: str) -> None:
+
+        self.results_list.clear()
+
+        for map_lyr in self.layer_name_index.search(text, self.max_results):
+            item = QListWidgetItem(map_lyr.name())
+            item.setData(Qt.UserRole, map_lyr.id())
+            self.results_list.addItem(item)
+
+        self.results_list.setCurrentRow(0)
+
+    def toggle_current(self) -> None:
+
+        item = self.results_list.currentItem()
+
+        if item:
+            self.toggle_item(item)
+
+    def toggle_item(self, item: QListWidgetItem) -> None:
+
+        map_lyr = self.layer_name_index.qgs_project.mapLayer(item.data(Qt.UserRole))
+
+        if map_lyr:
+            toggle_map_lyr(map_lyr)
+
+        self.accept()
+
+    def eventFilter(self, obj, event) -> bool:
+
+        # Let the arrow keys move through the results while typing
+        if obj is self.search_line_edit and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+                QApplication.sendEvent(self.results_list, event)
+                return True
+
+        return super().eventFilter(obj, event)
@@ -10,6 +10,7 @@ from qgis.core import QgsDefaultValue, QgsProject, Qgis, QgsMapLayerProxyModel,
 from qgis.utils import iface
 
 # PyQt
+from qgis.PyQt import sip
 from qgis.PyQt.QtCore import QObject, pyqtSignal
 from qgis.PyQt.QtGui import QKeySequence
 from qgis.PyQt.QtWidgets import QShortcut,QApplication, QAction
@@ -19,6 +20,9 @@ class LayerShortcut(QObject):
 
     validChanged = pyqtSignal(bool)
 
+    # Emitted whenever anything written by to_xml() changes
+    changed = pyqtSignal()
+
     def __init__(self, parent, widget, shortcut_str: str, map_lyr: QgsMapLayer):
 
         super().__init__(parent)
@@ -41,29 +45,27 @@ class LayerShortcut(QObject):
 
         if self.is_valid():
             # QgsMessageLog.logMessage(f"Shortcut pressed! for " + self.map_lyr_name(), tag=__title__, level=Qgis.Info)
-
-            # Get layer's node from the layer tree
-            layer_tree_node = QgsProject.instance().layerTreeRoot().findLayer(self.map_lyr.id())
-
-            # If valid, set toggle its visibility
-            if layer_tree_node:
-                layer_tree_node.setItemVisibilityChecked(not layer_tree_node.isVisible())
-
+            toggle_map_lyr(self.map_lyr)
 
     def set_map_lyr(self, map_lyr):
 
+        # Release previous map layer
+        if self.map_lyr is not None:
+            # QgsMessageLog.logMessage(f"Removed map layer'", tag=__title__, level=Qgis.Info)
+            self.map_lyr.willBeDeleted.disconnect(self.remove_map_lyr)
+            self.map_lyr.nameChanged.disconnect(self.changed)
+            self.map_lyr = None
+
         if map_lyr:
             # QgsMessageLog.logMessage(f"Loaded map layer '{map_lyr.name()}'", tag=__title__, level=Qgis.Info)
             self.map_lyr = map_lyr
             self.map_lyr.willBeDeleted.connect(self.remove_map_lyr)
 
-        else:
-            # QgsMessageLog.logMessage(f"Removed map layer'", tag=__title__, level=Qgis.Info)
-            if self.map_lyr is not None:
-                self.map_lyr.willBeDeleted.disconnect(self.remove_map_lyr)
-                self.map_lyr = None
+            # Layer name is what gets saved, so renaming the layer is a change
+            self.map_lyr.nameChanged.connect(self.changed)
 
         self.check_validity()
+        self.changed.emit()
 
     def remove_map_lyr(self):
 
@@ -127,12 +129,16 @@ class LayerShortcut(QObject):
                     return False
 
         self.shortcut.setKey(QKeySequence(value))
+        self.changed.emit()
         return True
 
     def delete_shortcut(self) -> None:
 
-        self.shortcut.setParent(None)
-        self.shortcut.deleteLater()
+        self.shortcut.activated.disconnect(self.shortcut_pressed)
+
+        # Delete now, so that it is gone from the widget's children straight away
+        sip.delete(self.shortcut)
+        self.shortcut = None
 
     def get_shortcut_str(self) -> str:
 
@@ -159,6 +165,23 @@ class LayerShortcut(QObject):
 
     def delete(self):
 
+        # Release map layer without emitting changed/validChanged
+        if self.map_lyr is not None:
+            self.map_lyr.willBeDeleted.disconnect(self.remove_map_lyr)
+            self.map_lyr.nameChanged.disconnect(self.changed)
+            self.map_lyr = None
+
         self.delete_shortcut()
-        self.setParent(None)
-        self.deleteLater()
+
+        # Delete synchronously rather than waiting for the event loop
+        sip.delete(self)
+
+
+def toggle_map_lyr(map_lyr: QgsMapLayer) -> None:
+
+    # Get layer's node from the layer tree
+    layer_tree_node = QgsProject.instance().layerTreeRoot().findLayer(map_lyr.id())
+
+    # If valid, set toggle its visibility
+    if layer_tree_node:
+        layer_tree_node.setItemVisibilityChecked(not layer_tree_node.isVisible())
@@ -0,0 +1,105 @@
+# Misc
+from typing import TYPE_CHECKING, Set, Tuple
+
+if TYPE_CHECKING:
+    from quicklayers.layer_shortcut import LayerShortcut
+
+
+class LayerShortcutSearchIndex:
+    """Lowercase layer names and shortcut strings of every layer shortcut.
+
+    Trigrams of both strings are indexed so that a substring search only checks the
+    layer shortcuts sharing every trigram of the search string. The index is updated
+    one layer shortcut at a time by LayerShortcutTableModel.
+    """
+
+    def __init__(self):
+
+        self.keys = {}
+        self.trigrams = {}
+
+        # Last search, dropped whenever the index changes
+        self.last_text = None
+        self.last_matches = set()
+
+    def add(self, layer_shortcut: 'LayerShortcut') -> None:
+
+        map_lyr = layer_shortcut.get_map_lyr()
+
+        keys = (
+            map_lyr.name().lower() if map_lyr else '',
+            layer_shortcut.shortcut.key().toString().lower(),
+        )
+        self.keys[layer_shortcut] = keys
+
+        for trigram in key_trigrams(keys):
+            self.trigrams.setdefault(trigram, set()).add(layer_shortcut)
+
+        self.reset_search()
+
+    def remove(self, layer_shortcut: 'LayerShortcut') -> None:
+
+        keys = self.keys.pop(layer_shortcut, None)
+
+        if keys is not None:
+            for trigram in key_trigrams(keys):
+                layer_shortcuts = self.trigrams[trigram]
+                layer_shortcuts.discard(layer_shortcut)
+                if not layer_shortcuts:
+                    del self.trigrams[trigram]
+
+        self.reset_search()
+
+    def update(self, layer_shortcut: 'LayerShortcut') -> None:
+
+        self.remove(layer_shortcut)
+        self.add(layer_shortcut)
+
+    def clear(self) -> None:
+
+        self.keys.clear()
+        self.trigrams.clear()
+        self.reset_search()
+
+    def reset_search(self) -> None:
+
+        # Do not keep removed layer shortcuts alive through cached results
+        self.last_text = None
+        self.last_matches = set()
+
+    def search(self, text: str) -> Set['LayerShortcut']:
+
+        text = text.lower()
+
+        if text == self.last_text:
+            return self.last_matches
+
+        # Narrow down to layer shortcuts containing every trigram of the search string
+        candidates = self.keys
+        query_trigrams = key_trigrams((text,))
+        if query_trigrams:
+            trigram_sets = sorted((self.trigrams.get(trigram, set()) for trigram in query_trigrams), key=len)
+            candidates = set.intersection(*trigram_sets)
+
+        self.last_text = text
+        self.last_matches = {
+            layer_shortcut for layer_shortcut in candidates
+            if any(text in key for key in self.keys[layer_shortcut])
+        }
+
+        return self.last_matches
+
+    def sort_key(self, layer_shortcut: 'LayerShortcut', column_header_label: str) -> str:
+
+        map_lyr_key, shortcut_key = self.keys[layer_shortcut]
+
+        if column_header_label == "Layer":
+            return map_lyr_key
+        if column_header_label == "Shortcut":
+            return shortcut_key
+        return ''
+
+
+def key_trigrams(keys: Tuple[str, ...]) -> Set[str]:
+
+    return {key[i:i + 3] for key in keys for i in range(len(key) - 2)}
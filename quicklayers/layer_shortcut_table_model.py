@@ -1,5 +1,6 @@
 # Project
 from quicklayers.layer_shortcut import LayerShortcut
+from quicklayers.layer_shortcut_search_index import LayerShortcutSearchIndex
 from quicklayers.__about__ import __title__
 
 # Misc
@@ -9,13 +10,13 @@ import json
 
 # qgis
 from qgis.gui import QgsMapLayerComboBox
-from qgis.core import QgsProject, QgsMapLayerProxyModel, QgsMessageLog, Qgis
+from qgis.core import QgsIconUtils, QgsProject, QgsMapLayerProxyModel, QgsMessageLog, Qgis
 
 # PyQt
-from qgis.PyQt.QtCore import QModelIndex, Qt, QAbstractTableModel, QVariant, QSize, pyqtSlot
+from qgis.PyQt.QtCore import QEvent, QModelIndex, Qt, QAbstractTableModel, QSortFilterProxyModel, QTimer, QVariant, QSize, pyqtSlot
 from qgis.PyQt.QtGui import QColor
-from qgis.PyQt.QtWidgets import QItemDelegate, QStyledItemDelegate, QDialog, QPushButton
-from qgis.PyQt.QtXml import QDomElement
+from qgis.PyQt.QtWidgets import QItemDelegate, QStyle, QStyledItemDelegate, QDialog, QPushButton
+from qgis.PyQt.QtXml import QDomDocument, QDomElement
 
 
 class LayerShortcutTableModel(QAbstractTableModel):
@@ -31,6 +32,15 @@ class LayerShortcutTableModel(QAbstractTableModel):
 
         self.layer_shortcuts = []
 
+        # Cached XML serialization, reused by to_xml() until something changes
+        self.xml_doc = QDomDocument()
+        self.xml_elem = None
+        self.xml_dirty = True
+        self.xml_row_elems = {}
+
+        # Lowercase names and shortcuts used for filtering and sorting
+        self.search_index = LayerShortcutSearchIndex()
+
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
             header_name = self.header_labels[section]
@@ -61,6 +71,14 @@ class LayerShortcutTableModel(QAbstractTableModel):
 
             return layer_shortcut.get_shortcut_str()
 
+        # Layer cells are painted from the model, the combo box only opens while editing
+        if column_header_label == "Layer" and layer_shortcut.map_lyr is not None:
+            if role == Qt.DisplayRole:
+                return layer_shortcut.map_lyr.name()
+
+            if role == Qt.DecorationRole:
+                return QgsIconUtils.iconForLayer(layer_shortcut.map_lyr)
+
         if role == Qt.ForegroundRole:
             if not layer_shortcut.is_valid():
                 return QColor(180, 180, 180)
@@ -74,6 +92,10 @@ class LayerShortcutTableModel(QAbstractTableModel):
         if not index.isValid():
             return Qt.NoItemFlags
 
+        # Remove buttons are painted and clicked through RemoveDelegate, without an editor
+        if self.header_labels[index.column()] == "Remove":
+            return Qt.ItemIsEnabled
+
         return Qt.ItemIsEnabled | Qt.ItemIsEditable
 
     def setData(self, index, value, role=Qt.EditRole):
@@ -104,19 +126,35 @@ class LayerShortcutTableModel(QAbstractTableModel):
             self.layer_shortcuts.append(layer_shortcut)
 
             layer_shortcut.validChanged.connect(self.refresh_layer_shortcut)
+            layer_shortcut.changed.connect(self.layer_shortcut_changed)
+
+            self.search_index.add(layer_shortcut)
 
         self.endInsertRows()
 
+        self.xml_dirty = True
+
     @pyqtSlot()
     def refresh_layer_shortcut(self) -> None:
         # QgsMessageLog.logMessage(f"Loaded map layer '{self.sender()}'", tag=__title__, level=Qgis.Info)
         row = self.layer_shortcuts.index(self.sender())
 
         index1 = self.createIndex(row, 0)
-        index2 = self.createIndex(row, self.columnCount())
+        index2 = self.createIndex(row, self.columnCount() - 1)
 
         self.dataChanged.emit(index1, index2)
 
+    @pyqtSlot()
+    def layer_shortcut_changed(self) -> None:
+        layer_shortcut = self.sender()
+
+        self.xml_row_elems.pop(layer_shortcut, None)
+        self.xml_dirty = True
+
+        self.search_index.update(layer_shortcut)
+
+        row = self.layer_shortcuts.index(layer_shortcut)
+        self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, self.columnCount() - 1))
 
     def remove_layer_shortcut(self, layer_shortcut: LayerShortcut) -> None:
         try:
@@ -124,9 +162,12 @@ class LayerShortcutTableModel(QAbstractTableModel):
 
             self.beginRemoveRows(QModelIndex(), row, row)
 
-            layer_shortcut.delete()
-
             self.layer_shortcuts.remove(layer_shortcut)
+            self.xml_row_elems.pop(layer_shortcut, None)
+            self.xml_dirty = True
+            self.search_index.remove(layer_shortcut)
+
+            self.delete_layer_shortcut(layer_shortcut)
 
             self.endRemoveRows()
 
@@ -138,13 +179,26 @@ class LayerShortcutTableModel(QAbstractTableModel):
 
             self.beginRemoveRows(QModelIndex(), 0, self.rowCount() - 1)
 
-            for layer_shortcut in self.layer_shortcuts:
-                layer_shortcut.delete()
+            layer_shortcuts = list(self.layer_shortcuts)
 
             self.layer_shortcuts.clear()
+            self.xml_row_elems.clear()
+            self.xml_dirty = True
+            self.search_index.clear()
+
+            for layer_shortcut in layer_shortcuts:
+                self.delete_layer_shortcut(layer_shortcut)
 
             self.endRemoveRows()
 
+    def delete_layer_shortcut(self, layer_shortcut: LayerShortcut) -> None:
+
+        # Drop the model's connections before deleting, so nothing is left pointing at it
+        layer_shortcut.validChanged.disconnect(self.refresh_layer_shortcut)
+        layer_shortcut.changed.disconnect(self.layer_shortcut_changed)
+
+        layer_shortcut.delete()
+
     def get_layer_shortcuts(self):
         return self.layer_shortcuts
 
@@ -192,6 +246,25 @@ class LayerShortcutTableModel(QAbstractTableModel):
             outfile.write(json_object)
 
 
+    def to_xml(self, doc: QDomDocument) -> QDomElement:
+
+        # Only re-serialize rows that changed since the last call
+        if self.xml_dirty:
+            self.xml_elem = self.xml_doc.createElement('layer_shortcut')
+
+            for layer_shortcut in self.layer_shortcuts:
+                layer_shortcut_elem = self.xml_row_elems.get(layer_shortcut)
+                if layer_shortcut_elem is None:
+                    layer_shortcut_elem = layer_shortcut.to_xml(self.xml_doc)
+                    self.xml_row_elems[layer_shortcut] = layer_shortcut_elem
+
+                self.xml_elem.appendChild(layer_shortcut_elem)
+
+            self.xml_dirty = False
+
+        # Copy the cached fragment into the target document
+        return doc.importNode(self.xml_elem, True).toElement()
+
     def from_xml(self, elem: QDomElement):
         self.clear_layer_shortcuts()
 
@@ -225,6 +298,39 @@ class LayerShortcutTableModel(QAbstractTableModel):
         self.add_layer_shortcuts(layer_shortcuts)
 
 
+class LayerShortcutFilterProxyModel(QSortFilterProxyModel):
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.filter_str = ''
+
+    def set_filter_str(self, value: str) -> None:
+        self.filter_str = value.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent) -> bool:
+        if not self.filter_str:
+            return True
+
+        # Results are cached by the search index until it changes
+        matches = self.sourceModel().search_index.search(self.filter_str)
+
+        return self.sourceModel().layer_shortcuts[source_row] in matches
+
+    def lessThan(self, left, right) -> bool:
+        model = self.sourceModel()
+        search_index = model.search_index
+        column_header_label = model.header_labels[left.column()]
+
+        left_key = search_index.sort_key(model.layer_shortcuts[left.row()], column_header_label)
+        right_key = search_index.sort_key(model.layer_shortcuts[right.row()], column_header_label)
+
+        if left_key == right_key:
+            return left.row() < right.row()
+        return left_key < right_key
+
+
 class QgsMapLayerComboDelegate(QStyledItemDelegate):
 
     def __init__(self, parent):
@@ -234,10 +340,15 @@ class QgsMapLayerComboDelegate(QStyledItemDelegate):
         editor = QgsMapLayerComboBox(parent)
         #editor.setFilters(QgsMapLayerProxyModel.VectorLayer)
         editor.setAllowEmptyLayer(True)
-        editor.layerChanged.connect(lambda: self.closeEditor.emit(editor))
+        editor.layerChanged.connect(lambda: self.commit_and_close_editor(editor))
         return editor
 
+    def commit_and_close_editor(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
     def setEditorData(self, editor, index):
+        index = source_index(index)
         map_lyr = index.model().layer_shortcuts[index.row()].map_lyr
         editor.setLayer(map_lyr)
 
@@ -245,25 +356,52 @@ class QgsMapLayerComboDelegate(QStyledItemDelegate):
         data = editor.currentLayer()
         model.setData(index, data)
 
+    def destroyEditor(self, editor, index):
+        # The view may release an editor from within one of its own signals, so only
+        # its connections are dropped right away and the widget itself is deleted later
+        editor.layerChanged.disconnect()
+        editor.deleteLater()
+
 
 class RemoveDelegate(QItemDelegate):
 
+    icon_size = QSize(20, 20)
+
     def __init__(self, parent, delete_icon):
         super().__init__(parent)
         self.delete_icon = delete_icon
 
-    def createEditor(self, parent, option, index):
-        model = index.model()
-        template = model.layer_shortcuts[index.row()]
-        editor = QPushButton(parent)
-        editor.setIcon(self.delete_icon)
-        editor.setIconSize(QSize(20, 20))
-        editor.clicked.connect(lambda: model.remove_layer_shortcut(template))
-        # editor.setWindowFlags(Qt.Popup)
-        return editor
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
 
-    def setModelData(self, editor, model, index):
-        model.setData(index, True)
+        icon_rect = QStyle.alignedRect(option.direction, Qt.AlignCenter, self.icon_size, option.rect)
+        self.delete_icon.paint(painter, icon_rect)
+
+    def sizeHint(self, option, index):
+        return self.icon_size + QSize(10, 10)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton \
+                and option.rect.contains(event.pos()):
+
+            index = source_index(index)
+            source_model = index.model()
+            layer_shortcut = source_model.layer_shortcuts[index.row()]
+
+            # Remove once the view is done handling the click on this row
+            QTimer.singleShot(0, lambda: source_model.remove_layer_shortcut(layer_shortcut))
+            return True
+
+        return super().editorEvent(event, model, option, index)
+
+
+def source_index(index: QModelIndex) -> QModelIndex:
+
+    # The table model may be viewed through a filter/sort proxy
+    while isinstance(index.model(), QSortFilterProxyModel):
+        index = index.model().mapToSource(index)
+
+    return index
 
 
 def map_lyr_by_name(qgs_project: QgsProject, name):
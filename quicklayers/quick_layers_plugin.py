@@ -7,6 +7,7 @@ from qgis.gui import QgisInterface
 from qgis.utils import showPluginHelp
 
 # PyQT
+from qgis.PyQt import sip
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction, QDockWidget
@@ -30,7 +31,8 @@ class QuickLayersPlugin:
         # Clean up templates
         self.dock_widget.widget().clean_up()
 
-        # Clean up dock widget
+        # Clean up dock widget, deleting it and its children right away
         self.dock_widget.hide()
         self.iface.removeDockWidget(self.dock_widget)
-        self.dock_widget.deleteLater()
+        sip.delete(self.dock_widget)
+        self.dock_widget = None
@@ -1,5 +1,6 @@
 # Project
 from quicklayers.layer_shortcut_table_model import *
+from quicklayers.layer_palette import LayerNameIndex, LayerPaletteDialog
 from quicklayers.__about__ import __title__
 
 # Standard
@@ -7,17 +8,20 @@ from pathlib import Path
 import os
 
 # qgis
+from qgis.gui import QgsFilterLineEdit
 from qgis.core import QgsMessageLog, QgsProject, Qgis, QgsApplication, QgsSettings, QgsMapLayer
 
 # PyQt
 from qgis.PyQt import uic
-from qgis.PyQt.QtCore import QSize
-from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QWidget, QHeaderView, QFileDialog, QPushButton, QToolBar, QAction
+from qgis.PyQt.QtCore import QSize, Qt
+from qgis.PyQt.QtGui import QIcon, QKeySequence
+from qgis.PyQt.QtWidgets import QWidget, QAbstractItemView, QHeaderView, QFileDialog, QPushButton, QToolBar, QAction, QShortcut
 from qgis.PyQt.QtXml import QDomDocument, QDomElement
 
 class QuickLayersWidget(QWidget):
 
+    layer_palette_shortcut_str = 'Ctrl+Shift+Space'
+
     def __init__(self, parent=None):
 
         super().__init__(parent)
@@ -29,6 +33,7 @@ class QuickLayersWidget(QWidget):
 
         # Initialize table
         self.table_model = None
+        self.table_proxy_model = None
         self.table_map_lyr_delegate = None
         self.init_table()
 
@@ -49,6 +54,10 @@ class QuickLayersWidget(QWidget):
         self.action_save_templates.setStatusTip("Save templates")
         self.action_save_templates.triggered.connect(self.save_layer_shortcuts_dialog)
 
+        self.action_layer_palette = QAction(QgsApplication.getThemeIcon('/mActionShowAllLayers.svg'), f"Toggle layer ({self.layer_palette_shortcut_str})", self)
+        self.action_layer_palette.setStatusTip("Search for a layer and toggle its visibility")
+        self.action_layer_palette.triggered.connect(self.open_layer_palette)
+
         # Toolbar
         self.toolbar = QToolBar()
         self.toolbar_layout.addWidget(self.toolbar)
@@ -56,8 +65,22 @@ class QuickLayersWidget(QWidget):
         self.toolbar.addAction(self.action_clear_templates)
         self.toolbar.addAction(self.action_load_templates)
         self.toolbar.addAction(self.action_save_templates)
+        self.toolbar.addAction(self.action_layer_palette)
         self.toolbar.setIconSize(QSize(18,18))
 
+        # Filter
+        self.filter_line_edit = QgsFilterLineEdit()
+        self.filter_line_edit.setShowSearchIcon(True)
+        self.filter_line_edit.setPlaceholderText("Filter by layer or shortcut")
+        self.filter_line_edit.textChanged.connect(self.table_proxy_model.set_filter_str)
+        self.toolbar_layout.addWidget(self.filter_line_edit)
+
+        # Layer palette, using a layer name index that is kept up to date with the project
+        self.layer_name_index = LayerNameIndex(self, QgsProject.instance())
+        self.layer_palette = LayerPaletteDialog(self, self.layer_name_index)
+        self.layer_palette_shortcut = QShortcut(QKeySequence(self.layer_palette_shortcut_str), self)
+        self.layer_palette_shortcut.activated.connect(self.open_layer_palette)
+
         # On project load/save
         QgsProject.instance().readProject.connect(self.project_load)
         QgsProject.instance().writeProject.connect(self.project_save)
@@ -72,10 +95,23 @@ class QuickLayersWidget(QWidget):
 
         # Set table's model
         self.table_model = LayerShortcutTableModel(parent=self)
-        self.table_model.rowsInserted.connect(self.table_rows_inserted)
+
+        # Filter and sort the table through a proxy
+        self.table_proxy_model = LayerShortcutFilterProxyModel(parent=self)
+        self.table_proxy_model.setSourceModel(self.table_model)
 
         # Connect model to view
-        self.table_view.setModel(self.table_model)
+        self.table_view.setModel(self.table_proxy_model)
+
+        # Cells are painted by the delegates, and at most one editor is open at a time
+        self.table_view.setEditTriggers(
+            QAbstractItemView.CurrentChanged | QAbstractItemView.SelectedClicked |
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+        )
+
+        # Sortable columns, starting in insertion order
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
 
         # Set delegate for map layer column
         col_map_lyr = 1
@@ -95,20 +131,26 @@ class QuickLayersWidget(QWidget):
         for col_num in [2]:
             header.setSectionResizeMode(col_num, QHeaderView.ResizeMode.ResizeToContents)
 
-    def table_rows_inserted(self, parent, first, last):
-
-        for row in range(first, last + 1):
-            for col in [1,2]:  # These are the columns with persistent widgets
-                self.table_view.openPersistentEditor(self.table_model.index(row, col))
-
     def add_template_dialog(self):
 
         template = LayerShortcut(parent=self.table_model, widget=self, shortcut_str=None, map_lyr=None)
 
         self.table_model.add_layer_shortcuts([template])
 
+    def open_layer_palette(self):
+
+        self.layer_palette.open_palette()
+
     def clean_up(self):
 
+        # Stop listening to the project before anything else is torn down
+        QgsProject.instance().readProject.disconnect(self.project_load)
+        QgsProject.instance().writeProject.disconnect(self.project_save)
+
+        self.layer_palette_shortcut.activated.disconnect(self.open_layer_palette)
+        self.layer_palette.close()
+        self.layer_name_index.clean_up()
+
         self.table_model.clear_layer_shortcuts()
 
     def load_layer_shortcuts_dialog(self):
@@ -139,19 +181,11 @@ class QuickLayersWidget(QWidget):
 
     def project_save(self, doc: QDomDocument):
 
-        templates = self.table_model.get_layer_shortcuts()
-
-        if len(templates) > 0:
+        if self.table_model.rowCount() > 0:
 
             root = doc.childNodes().item(0)
             plugin_elem = doc.createElement('quick_layers')
-            templates_elem = doc.createElement('layer_shortcut')
-
-            for template in templates:
-                template_xml = template.to_xml(doc)
-                templates_elem.appendChild(template_xml)
-
-            plugin_elem.appendChild(templates_elem)
+            plugin_elem.appendChild(self.table_model.to_xml(doc))
             root.appendChild(plugin_elem)
 
 
@@ -0,0 +1,64 @@
+"""Benchmark typing in the binding table's filter box, reporting timings and open editors.
+
+Needs QGIS. Run from the repository root:
+
+    python -m tests.benchmark_filter --bindings 10000
+"""
+
+# Project
+from quicklayers.quick_layers_widget import QuickLayersWidget
+from tests.lifecycle import bindings_elem
+from tests.test_quick_layers_widget import KEYSTROKES, editor_count
+
+# Standard
+from argparse import ArgumentParser
+import time
+
+# qgis
+from qgis.core import QgsApplication, QgsProject, QgsVectorLayer
+
+# PyQt
+from qgis.PyQt.QtCore import QCoreApplication
+
+
+def main():
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bindings', type=int, default=10000)
+    parser.add_argument('--keyed', type=int, default=0, help="Number of bindings with a shortcut key")
+    args = parser.parse_args()
+
+    app = QgsApplication([], True)
+    app.initQgis()
+
+    map_lyrs = [QgsVectorLayer('Point', f'layer_{i}', 'memory') for i in range(10)]
+    QgsProject.instance().addMapLayers(map_lyrs)
+
+    widget = QuickLayersWidget()
+    widget.resize(400, 600)
+    widget.show()
+
+    doc, elem = bindings_elem(args.bindings, args.keyed, [map_lyr.name() for map_lyr in map_lyrs])
+
+    start = time.perf_counter()
+    widget.table_model.from_xml(elem)
+    QCoreApplication.processEvents()
+    print(f"Loaded {args.bindings} bindings in {time.perf_counter() - start:.3f} s, {editor_count(widget)} editors")
+
+    print(f"{'filter':>10} {'time (s)':>9} {'rows':>6} {'editors':>8}")
+
+    for text in KEYSTROKES:
+        start = time.perf_counter()
+        widget.filter_line_edit.setText(text)
+        QCoreApplication.processEvents()
+        elapsed = time.perf_counter() - start
+
+        print(f"{repr(text):>10} {elapsed:>9.3f} {widget.table_proxy_model.rowCount():>6} {editor_count(widget):>8}")
+
+    widget.clean_up()
+    QgsProject.instance().removeAllMapLayers()
+    app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
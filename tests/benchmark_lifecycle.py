@@ -0,0 +1,68 @@
+"""Benchmark loading and clearing bindings, reporting live object counts and RSS.
+
+Needs QGIS. Run from the repository root:
+
+    python -m tests.benchmark_lifecycle --bindings 10000 --cycles 20
+
+Every binding gets a distinct shortcut key unless --keyed says otherwise. Each keyed
+binding is checked against all existing shortcuts, so load times grow quadratically with
+the number of keyed bindings; compare with --keyed 0.
+"""
+
+# Project
+from quicklayers.layer_shortcut_table_model import LayerShortcutTableModel
+from tests.lifecycle import bindings_elem, live_counts, rss_bytes
+
+# Standard
+from argparse import ArgumentParser
+import time
+
+# qgis
+from qgis.core import QgsApplication, QgsProject, QgsVectorLayer
+
+# PyQt
+from qgis.PyQt.QtWidgets import QWidget
+
+
+def main():
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bindings', type=int, default=10000)
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--keyed', type=int, help="Number of bindings with a shortcut key, defaults to all")
+    args = parser.parse_args()
+
+    n_keyed = args.bindings if args.keyed is None else args.keyed
+
+    app = QgsApplication([], True)
+    app.initQgis()
+
+    map_lyrs = [QgsVectorLayer('Point', f'layer_{i}', 'memory') for i in range(10)]
+    QgsProject.instance().addMapLayers(map_lyrs)
+
+    widget = QWidget()
+    table_model = LayerShortcutTableModel(parent=widget)
+    doc, elem = bindings_elem(args.bindings, n_keyed, [map_lyr.name() for map_lyr in map_lyrs])
+
+    print(f"{args.bindings} bindings, {n_keyed} with a shortcut key")
+    print(f"{'cycle':>5} {'load (s)':>9} {'clear (s)':>9} {'shortcuts':>9} {'keyed':>9} {'bindings':>9} {'RSS (MB)':>9}")
+
+    for cycle in range(args.cycles):
+        start = time.perf_counter()
+        table_model.from_xml(elem)
+        loaded = time.perf_counter()
+        table_model.clear_layer_shortcuts()
+        cleared = time.perf_counter()
+
+        counts = live_counts(widget, table_model)
+        print(
+            f"{cycle:>5} {loaded - start:>9.3f} {cleared - loaded:>9.3f} {counts['shortcuts']:>9} "
+            f"{counts['keyed_shortcuts']:>9} {counts['layer_shortcuts']:>9} {rss_bytes() / 1024 ** 2:>9.1f}"
+        )
+
+    QgsProject.instance().removeAllMapLayers()
+    app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
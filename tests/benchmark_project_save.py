@@ -0,0 +1,124 @@
+"""Benchmark saving bindings into a project, with and without the cached XML fragment.
+
+Needs QGIS. Run from the repository root:
+
+    python -m tests.benchmark_project_save --bindings 10000
+
+Compares QuickLayersWidget.project_save with the per-row serialization it replaced,
+when no row changed since the last save, when one row changed and when every row
+has to be serialized, as on the first save after loading a project.
+"""
+
+# Project
+from quicklayers.quick_layers_widget import QuickLayersWidget
+from tests.lifecycle import bindings_elem, rss_bytes
+
+# Standard
+from argparse import ArgumentParser
+import time
+
+# qgis
+from qgis.core import QgsApplication, QgsProject, QgsVectorLayer
+
+# PyQt
+from qgis.PyQt.QtXml import QDomDocument
+
+
+def project_doc() -> QDomDocument:
+    """Empty document with a root element, as passed to project_save by writeProject."""
+
+    doc = QDomDocument('qgis')
+    doc.appendChild(doc.createElement('qgis'))
+    return doc
+
+
+def per_row_project_save(widget: QuickLayersWidget, doc: QDomDocument) -> None:
+    """project_save as it was before the XML cache: every row is serialized on every save."""
+
+    templates = widget.table_model.get_layer_shortcuts()
+
+    if len(templates) > 0:
+
+        root = doc.childNodes().item(0)
+        plugin_elem = doc.createElement('quick_layers')
+        templates_elem = doc.createElement('layer_shortcut')
+
+        for template in templates:
+            template_xml = template.to_xml(doc)
+            templates_elem.appendChild(template_xml)
+
+        plugin_elem.appendChild(templates_elem)
+        root.appendChild(plugin_elem)
+
+
+def best_time(save, prepare, repeat: int) -> float:
+    """Shortest of 'repeat' timings of save(doc), calling prepare() untimed before each."""
+
+    times = []
+
+    for _ in range(repeat):
+        prepare()
+        doc = project_doc()
+
+        start = time.perf_counter()
+        save(doc)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bindings', type=int, default=10000)
+    parser.add_argument('--keyed', type=int, default=0, help="Number of bindings with a shortcut key")
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    app = QgsApplication([], True)
+    app.initQgis()
+
+    map_lyrs = [QgsVectorLayer('Point', f'layer_{i}', 'memory') for i in range(10)]
+    QgsProject.instance().addMapLayers(map_lyrs)
+
+    widget = QuickLayersWidget()
+    doc, elem = bindings_elem(args.bindings, args.keyed, [map_lyr.name() for map_lyr in map_lyrs])
+    widget.table_model.from_xml(elem)
+
+    table_model = widget.table_model
+    changed = table_model.get_layer_shortcuts()[args.bindings // 2]
+
+    def nothing():
+        pass
+
+    def change_one_row():
+        # As a rename or a new key does
+        changed.changed.emit()
+
+    def drop_cache():
+        table_model.xml_row_elems.clear()
+        table_model.xml_dirty = True
+
+    rss_before = rss_bytes()
+    widget.project_save(project_doc())
+    rss_cache = rss_bytes() - rss_before
+
+    timings = [
+        ("per-row (before cache)", best_time(lambda doc: per_row_project_save(widget, doc), nothing, args.repeat)),
+        ("cached, no change", best_time(widget.project_save, nothing, args.repeat)),
+        ("cached, one row changed", best_time(widget.project_save, change_one_row, args.repeat)),
+        ("cached, all rows changed", best_time(widget.project_save, drop_cache, args.repeat)),
+    ]
+
+    print(f"{args.bindings} bindings, best of {args.repeat}")
+    for label, seconds in timings:
+        print(f"{label:<25} {seconds * 1000:>9.1f} ms")
+    print(f"{'cache RSS':<25} {rss_cache / 1024 ** 2:>9.1f} MB")
+
+    widget.clean_up()
+    QgsProject.instance().removeAllMapLayers()
+    app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# Standard
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qgis_app():
+    """QgsApplication shared by every test needing QGIS, skipped when it is not installed."""
+
+    qgis_core = pytest.importorskip("qgis.core")
+
+    app = qgis_core.QgsApplication([], True)
+    app.initQgis()
+
+    yield app
+
+    app.exitQgis()
+
+
+@pytest.fixture
+def map_lyr_names(qgis_app):
+    """Names of ten memory layers added to the project for the duration of a test."""
+
+    from qgis.core import QgsProject, QgsVectorLayer
+
+    map_lyrs = [QgsVectorLayer('Point', f'layer_{i}', 'memory') for i in range(10)]
+    QgsProject.instance().addMapLayers(map_lyrs)
+
+    yield [map_lyr.name() for map_lyr in map_lyrs]
+
+    QgsProject.instance().removeAllMapLayers()
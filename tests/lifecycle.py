@@ -0,0 +1,102 @@
+"""Helpers for checking that loading and clearing bindings does not leak."""
+
+# Project
+from quicklayers.layer_shortcut import LayerShortcut
+
+# Standard
+import gc
+import os
+import resource
+import sys
+
+# PyQt
+from qgis.PyQt.QtCore import QCoreApplication, QEvent
+from qgis.PyQt.QtWidgets import QApplication, QShortcut
+from qgis.PyQt.QtXml import QDomDocument
+
+
+# Two-chord sequences such as 'Ctrl+Alt+A, 7': 7 * 48 * 48 distinct keys
+MODIFIERS = ['Ctrl', 'Alt', 'Shift', 'Ctrl+Alt', 'Ctrl+Shift', 'Alt+Shift', 'Ctrl+Alt+Shift']
+KEYS = [chr(c) for c in range(ord('A'), ord('Z') + 1)] + [str(i) for i in range(10)] + [f'F{i}' for i in range(1, 13)]
+
+
+def shortcut_str(i: int) -> str:
+    """Return the i-th of a series of distinct, non-empty key sequences."""
+
+    if i >= len(MODIFIERS) * len(KEYS) ** 2:
+        raise ValueError(f"Only {len(MODIFIERS) * len(KEYS) ** 2} distinct key sequences are available")
+
+    i, modifier = divmod(i, len(MODIFIERS))
+    second, first = divmod(i, len(KEYS))
+
+    return f"{MODIFIERS[modifier]}+{KEYS[first]}, {KEYS[second]}"
+
+
+def bindings_elem(n_bindings: int, n_keyed: int, map_lyr_names):
+    """Return a document and its <layer_shortcut> element holding n_bindings rows.
+
+    Rows cycle through map_lyr_names plus one name missing from the project, so that
+    both bound and unresolved bindings are created. n_keyed rows, spread evenly through
+    the others, get distinct key sequences; the remaining keys are left empty.
+    """
+
+    doc = QDomDocument()
+    elem = doc.createElement('layer_shortcut')
+
+    names = list(map_lyr_names) + ['missing_layer']
+    keyed_rows = {j * n_bindings // n_keyed for j in range(n_keyed)} if n_keyed else set()
+
+    n_keys = 0
+    for i in range(n_bindings):
+        layer_shortcut_elem = doc.createElement('layer_shortcut')
+        layer_shortcut_elem.setAttribute('map_lyr', names[i % len(names)])
+
+        if i in keyed_rows:
+            layer_shortcut_elem.setAttribute('shortcut', shortcut_str(n_keys))
+            n_keys += 1
+        else:
+            layer_shortcut_elem.setAttribute('shortcut', '')
+
+        elem.appendChild(layer_shortcut_elem)
+
+    # The element is only valid while its document is alive
+    return doc, elem
+
+
+def keyed_shortcuts() -> int:
+    """Number of enabled shortcuts with a key, i.e. those Qt's shortcut map can trigger."""
+
+    return sum(
+        not shortcut.key().isEmpty() and shortcut.isEnabled()
+        for widget in QApplication.topLevelWidgets()
+        for shortcut in widget.findChildren(QShortcut)
+    )
+
+
+def live_counts(widget, table_model) -> dict:
+
+    return {
+        'shortcuts': len(widget.findChildren(QShortcut)),
+        'keyed_shortcuts': keyed_shortcuts(),
+        'layer_shortcuts': len(table_model.findChildren(LayerShortcut)),
+        'wrappers': sum(isinstance(obj, LayerShortcut) for obj in gc.get_objects()),
+    }
+
+
+def process_deferred_deletes() -> None:
+
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak one where it is not available."""
+
+    gc.collect()
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
@@ -0,0 +1,230 @@
+# Project
+from quicklayers import batch
+
+# Standard
+import json
+import os
+import zipfile
+
+import pytest
+
+PROLOG = (
+    "<?xml version='1.0' encoding='UTF-8'?>\n"
+    "<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>\n"
+)
+
+PROJECT = PROLOG + """<qgis projectname="" version="3.22">
+  <projectlayers>
+    <maplayer type="vector"><id>roads_1</id><layername>Roads</layername></maplayer>
+    <maplayer type="vector"><id>rivers_1</id><layername>Rivers</layername></maplayer>
+  </projectlayers>
+  <quick_layers>
+    <layer_shortcut>
+      <layer_shortcut map_lyr="Roads" shortcut="Ctrl+1"/>
+      <layer_shortcut map_lyr="Lakes" shortcut="Ctrl+1"/>
+      <layer_shortcut map_lyr="Rivers" shortcut="Ctrl+2"/>
+      <layer_shortcut map_lyr="None" shortcut="Ctrl+3"/>
+    </layer_shortcut>
+  </quick_layers>
+</qgis>
+"""
+
+BINDINGS = [
+    {'map_lyr_name': 'Roads', 'shortcut_str': 'Ctrl+1'},
+    {'map_lyr_name': 'Lakes', 'shortcut_str': 'Ctrl+1'},
+    {'map_lyr_name': 'Rivers', 'shortcut_str': 'Ctrl+2'},
+    {'map_lyr_name': 'None', 'shortcut_str': 'Ctrl+3'},
+]
+
+NEW_BINDINGS = [
+    {'map_lyr_name': 'Rivers', 'shortcut_str': 'Ctrl+5'},
+]
+
+
+@pytest.fixture
+def qgs_path(tmp_path):
+
+    path = tmp_path / 'project.qgs'
+    path.write_text(PROJECT, encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def qgz_path(tmp_path):
+
+    path = tmp_path / 'archive.qgz'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('archive.qgs', PROJECT)
+        archive.writestr('archive.qgd', b'auxiliary storage')
+    return path
+
+
+@pytest.fixture
+def json_path(tmp_path):
+
+    path = tmp_path / 'bindings.json'
+    path.write_text(json.dumps(NEW_BINDINGS))
+    return path
+
+
+def test_read_project(qgs_path):
+
+    project = batch.read_project(qgs_path)
+
+    assert project['bindings'] == BINDINGS
+    assert project['map_lyr_names'] == {'Roads', 'Rivers'}
+
+
+def test_read_project_qgz(qgz_path):
+
+    assert batch.read_project(qgz_path)['bindings'] == BINDINGS
+
+
+def test_audit_project(qgs_path):
+
+    result = batch.audit_project(qgs_path)
+
+    assert result['bindings'] == BINDINGS
+    assert result['unbound'] == ['Ctrl+3']
+    assert result['unresolved'] == ['Lakes']
+    assert result['conflicts'] == {'Ctrl+1': ['Roads', 'Lakes']}
+
+
+def test_audit_exit_status(tmp_path, qgs_path, capsys):
+
+    assert batch.main(['-j', '1', 'audit', str(qgs_path)]) == 1
+
+    # Bindings without a layer are reported but are not a failure
+    clean_path = tmp_path / 'clean.qgs'
+    clean_path.write_text(PROJECT.replace('<layer_shortcut map_lyr="Lakes" shortcut="Ctrl+1"/>', ''))
+
+    assert batch.main(['-j', '1', 'audit', str(clean_path)]) == 0
+    assert "Unbound shortcut: 'Ctrl+3'" in capsys.readouterr().out
+
+
+def test_export_import_round_trip(tmp_path, qgs_path, qgz_path):
+
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+
+    assert batch.main(['-j', '2', 'export', str(qgs_path), str(qgz_path), '-o', str(out_dir)]) == 0
+    assert json.loads((out_dir / 'project.json').read_text()) == BINDINGS
+    assert json.loads((out_dir / 'archive.json').read_text()) == BINDINGS
+
+    # Swap the bindings of both projects
+    qgs_json_path = out_dir / 'project.json'
+    qgs_json_path.write_text(json.dumps(NEW_BINDINGS))
+    assert batch.main(['-j', '2', 'import', str(qgs_json_path), str(qgs_path), str(qgz_path)]) == 0
+
+    assert batch.read_project(qgs_path)['bindings'] == NEW_BINDINGS
+    assert batch.read_project(qgz_path)['bindings'] == NEW_BINDINGS
+
+    # Layers, XML declaration and DOCTYPE are kept
+    data = qgs_path.read_text(encoding='utf-8')
+    assert data.startswith(PROLOG + '<qgis ')
+    assert batch.read_project(qgs_path)['map_lyr_names'] == {'Roads', 'Rivers'}
+
+    # Other members of the .qgz archive are kept
+    with zipfile.ZipFile(qgz_path) as archive:
+        assert sorted(archive.namelist()) == ['archive.qgd', 'archive.qgs']
+        assert archive.read('archive.qgd') == b'auxiliary storage'
+
+    # No temporary files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['archive.qgz', 'out', 'project.qgs']
+
+
+def test_import_empty_bindings(qgs_path):
+
+    batch.import_project(qgs_path, [])
+
+    assert batch.read_project(qgs_path)['bindings'] == []
+    assert '<quick_layers' not in qgs_path.read_text(encoding='utf-8')
+
+
+def test_import_keeps_file_mode(qgs_path):
+
+    os.chmod(qgs_path, 0o644)
+    batch.import_project(qgs_path, NEW_BINDINGS)
+
+    assert os.stat(qgs_path).st_mode & 0o777 == 0o644
+
+
+def test_import_rejects_other_root(tmp_path, json_path, capsys):
+
+    path = tmp_path / 'bad.qgs'
+    data = '<?xml version="1.0"?>\n<foo/>'
+    path.write_text(data)
+
+    assert batch.main(['-j', '1', 'import', str(json_path), str(path)]) == 2
+    assert "not 'qgis'" in capsys.readouterr().err
+    assert path.read_text() == data
+
+
+def test_root_start_skips_comments():
+
+    data = b'<?xml version="1.0"?>\n<!-- <qgis> -->\n<qgis/>'
+
+    assert data[batch.root_start(data):] == b'<qgis/>'
+
+
+@pytest.mark.parametrize('bindings', [
+    {'map_lyr_name': 'Roads', 'shortcut_str': 'Ctrl+1'},
+    [{'map_lyr_name': 1, 'shortcut_str': 'Ctrl+1'}],
+    [{'map_lyr_name': 'Roads'}],
+    ['Roads'],
+])
+def test_import_rejects_invalid_json(tmp_path, qgs_path, bindings):
+
+    bad_json_path = tmp_path / 'bad.json'
+    bad_json_path.write_text(json.dumps(bindings))
+
+    with pytest.raises(ValueError):
+        batch.load_bindings(bad_json_path)
+
+    with pytest.raises(SystemExit) as e:
+        batch.main(['-j', '2', 'import', str(bad_json_path), str(qgs_path)])
+
+    assert e.value.code == 2
+    assert qgs_path.read_text(encoding='utf-8') == PROJECT
+
+
+def test_import_failure_removes_temp_file(tmp_path, qgz_path, monkeypatch):
+
+    original = qgz_path.read_bytes()
+
+    def failing_writestr(*args, **kwargs):
+        raise OSError("disk full")
+
+    # Fail while the new archive is being written
+    monkeypatch.setattr(zipfile.ZipFile, 'writestr', failing_writestr)
+
+    with pytest.raises(OSError):
+        batch.import_project(qgz_path, NEW_BINDINGS)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['archive.qgz']
+    assert qgz_path.read_bytes() == original
+
+
+def test_export_rejects_duplicate_json_paths(tmp_path):
+
+    paths = []
+    for folder in ['a', 'b']:
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / 'x.qgs'
+        path.write_text(PROJECT, encoding='utf-8')
+        paths.append(str(path))
+
+    with pytest.raises(SystemExit) as e:
+        batch.main(['export', *paths, '-o', str(tmp_path)])
+
+    assert e.value.code == 2
+    assert not (tmp_path / 'x.json').exists()
+
+
+@pytest.mark.parametrize('jobs', ['0', '-1', 'many'])
+def test_invalid_jobs(qgs_path, jobs):
+
+    with pytest.raises(SystemExit) as e:
+        batch.main(['-j', jobs, 'audit', str(qgs_path)])
+
+    assert e.value.code == 2
@@ -0,0 +1,38 @@
+# Project
+from quicklayers.fuzzy_search import fuzzy_score
+
+# Standard
+import pytest
+
+
+@pytest.mark.parametrize('text, better, worse', [
+    # A late substring in a long name beats a scattered match in a short one
+    ('road', 'the long list of all major roads', 'rxoxaxd'),
+    ('road', 'roads', 'main roads'),
+    ('rds', 'roads', 'r o a d s'),
+    ('rds', 'rods', 'roads'),
+])
+def test_fuzzy_score_ranking(text, better, worse):
+
+    assert fuzzy_score(text, better) < fuzzy_score(text, worse)
+
+
+def test_fuzzy_score_substring():
+
+    assert fuzzy_score('road', 'roads') == (0, 0)
+    assert fuzzy_score('road', 'main roads') == (0, 5)
+
+
+def test_fuzzy_score_subsequence():
+
+    assert fuzzy_score('rds', 'roads') == (1, 5 + 4)
+
+
+@pytest.mark.parametrize('text, name', [
+    ('xyz', 'roads'),
+    ('sr', 'roads'),
+    ('roadss', 'roads'),
+])
+def test_fuzzy_score_no_match(text, name):
+
+    assert fuzzy_score(text, name) is None
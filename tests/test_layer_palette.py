@@ -0,0 +1,51 @@
+# Standard
+import pytest
+
+pytest.importorskip("qgis")
+
+# Project
+from quicklayers.layer_palette import LayerNameIndex
+
+# qgis
+from qgis.core import QgsProject, QgsVectorLayer
+
+
+def test_layer_name_index_take_and_readd(qgis_app):
+
+    qgs_project = QgsProject()
+    map_lyr = QgsVectorLayer('Point', 'Roads', 'memory')
+    qgs_project.addMapLayer(map_lyr)
+
+    layer_name_index = LayerNameIndex(None, qgs_project)
+
+    # Taking the layer out and adding it back must not leave two connections
+    qgs_project.takeMapLayer(map_lyr)
+    assert layer_name_index.map_lyrs == {}
+    qgs_project.addMapLayer(map_lyr)
+
+    generation = layer_name_index.generation
+    map_lyr.setName('Rivers')
+
+    assert layer_name_index.generation == generation + 1
+    assert [lyr.name() for lyr in layer_name_index.search('riv', 10)] == ['Rivers']
+
+    layer_name_index.clean_up()
+
+    qgs_project.removeAllMapLayers()
+
+
+def test_layer_name_index_remove_deleted_layer(qgis_app):
+
+    qgs_project = QgsProject()
+    qgs_project.addMapLayer(QgsVectorLayer('Point', 'Roads', 'memory'))
+
+    layer_name_index = LayerNameIndex(None, qgs_project)
+    [map_lyr_id] = layer_name_index.map_lyrs
+
+    # The project deletes the layer, after layersWillBeRemoved and before layersRemoved
+    qgs_project.removeMapLayer(map_lyr_id)
+
+    assert layer_name_index.map_lyrs == {}
+    assert layer_name_index.search('roads', 10) == []
+
+    layer_name_index.clean_up()
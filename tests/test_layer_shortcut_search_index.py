@@ -0,0 +1,166 @@
+# Project
+from quicklayers.layer_shortcut_search_index import LayerShortcutSearchIndex, key_trigrams
+
+# Standard
+import time
+
+import pytest
+
+
+class StubMapLayer:
+
+    def __init__(self, name):
+        self.layer_name = name
+
+    def name(self):
+        return self.layer_name
+
+
+class StubKeySequence:
+
+    def __init__(self, value):
+        self.value = value
+
+    def toString(self):
+        return self.value
+
+
+class StubShortcut:
+
+    def __init__(self, value):
+        self.value = value
+
+    def key(self):
+        return StubKeySequence(self.value)
+
+
+class StubLayerShortcut:
+    """Stands in for LayerShortcut, exposing what the search index reads."""
+
+    def __init__(self, map_lyr_name, shortcut_str):
+        self.map_lyr = StubMapLayer(map_lyr_name) if map_lyr_name else None
+        self.shortcut = StubShortcut(shortcut_str)
+
+    def get_map_lyr(self):
+        return self.map_lyr
+
+
+@pytest.fixture
+def layer_shortcuts():
+
+    return {
+        'roads': StubLayerShortcut('Roads', 'Ctrl+1'),
+        'rivers': StubLayerShortcut('Rivers', 'Ctrl+2'),
+        'unbound': StubLayerShortcut(None, 'Alt+R'),
+    }
+
+
+@pytest.fixture
+def search_index(layer_shortcuts):
+
+    search_index = LayerShortcutSearchIndex()
+    for layer_shortcut in layer_shortcuts.values():
+        search_index.add(layer_shortcut)
+    return search_index
+
+
+def test_key_trigrams():
+
+    assert key_trigrams(('roads', 'ab')) == {'roa', 'oad', 'ads'}
+    assert key_trigrams(('',)) == set()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('', ['roads', 'rivers', 'unbound']),
+    ('r', ['roads', 'rivers', 'unbound']),
+    ('RO', ['roads']),
+    ('riv', ['rivers']),
+    ('Rivers', ['rivers']),
+    ('ctrl', ['roads', 'rivers']),
+    ('ctrl+2', ['rivers']),
+    ('alt', ['unbound']),
+    ('xyz', []),
+    ('sctrl', []),
+])
+def test_search(search_index, layer_shortcuts, text, expected):
+
+    assert search_index.search(text) == {layer_shortcuts[name] for name in expected}
+
+
+def test_update(search_index, layer_shortcuts):
+
+    rivers = layer_shortcuts['rivers']
+    rivers.map_lyr = StubMapLayer('Roadside')
+    search_index.update(rivers)
+
+    assert search_index.search('road') == {layer_shortcuts['roads'], rivers}
+    assert search_index.search('riv') == set()
+    assert 'riv' not in search_index.trigrams
+
+
+def test_remove(search_index, layer_shortcuts):
+
+    search_index.search('ctrl')
+    search_index.remove(layer_shortcuts['roads'])
+
+    assert search_index.search('ctrl') == {layer_shortcuts['rivers']}
+    assert search_index.search('roa') == set()
+    assert 'roa' not in search_index.trigrams
+
+    # Removing twice is harmless
+    search_index.remove(layer_shortcuts['roads'])
+
+
+def test_clear(search_index):
+
+    search_index.search('ctrl')
+    search_index.clear()
+
+    assert search_index.keys == {}
+    assert search_index.trigrams == {}
+    assert search_index.last_matches == set()
+    assert search_index.search('ctrl') == set()
+
+
+def test_search_cache_dropped_on_change(search_index, layer_shortcuts):
+
+    assert search_index.search('ctrl') is search_index.search('ctrl')
+
+    search_index.remove(layer_shortcuts['rivers'])
+
+    assert layer_shortcuts['rivers'] not in search_index.last_matches
+    assert search_index.search('ctrl') == {layer_shortcuts['roads']}
+
+
+def test_sort_key(search_index, layer_shortcuts):
+
+    assert search_index.sort_key(layer_shortcuts['roads'], 'Layer') == 'roads'
+    assert search_index.sort_key(layer_shortcuts['roads'], 'Shortcut') == 'ctrl+1'
+    assert search_index.sort_key(layer_shortcuts['unbound'], 'Layer') == ''
+    assert search_index.sort_key(layer_shortcuts['roads'], 'Remove') == ''
+
+
+def test_search_10k_rows():
+
+    layer_shortcuts = [
+        StubLayerShortcut(f'Layer {i % 500} {name}', f'Ctrl+Alt+{i % 36}')
+        for i, name in enumerate(['roads', 'rivers', 'buildings', 'parcels'] * 2500)
+    ]
+
+    search_index = LayerShortcutSearchIndex()
+    for layer_shortcut in layer_shortcuts:
+        search_index.add(layer_shortcut)
+
+    # Every keystroke of a search string, then deleting it again
+    texts = ['r', 'ri', 'riv', 'rive', 'river', 'rivers', 'river', 'rive', 'riv', 'ri', 'r']
+
+    start = time.perf_counter()
+    for text in texts:
+        matches = search_index.search(text)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+
+    # Every shortcut contains 'ctrl'
+    assert len(matches) == 10000
+    assert len(search_index.search('rivers')) == 2500
@@ -0,0 +1,96 @@
+# Standard
+import pytest
+
+pytest.importorskip("qgis")
+
+# Project
+from quicklayers.layer_shortcut import LayerShortcut
+from quicklayers.layer_shortcut_table_model import LayerShortcutTableModel
+
+# PyQt
+from qgis.PyQt.QtWidgets import QWidget
+from qgis.PyQt.QtXml import QDomDocument
+
+
+@pytest.fixture
+def table_model(qgis_app):
+
+    widget = QWidget()
+    table_model = LayerShortcutTableModel(parent=widget)
+
+    table_model.add_layer_shortcuts([
+        LayerShortcut(parent=table_model, widget=widget, shortcut_str=shortcut_str, map_lyr=None)
+        for shortcut_str in ['Ctrl+Alt+1', 'Ctrl+Alt+2', 'Ctrl+Alt+3']
+    ])
+
+    yield table_model
+
+    table_model.clear_layer_shortcuts()
+
+
+@pytest.fixture
+def to_xml_calls(monkeypatch):
+
+    calls = []
+    to_xml = LayerShortcut.to_xml
+
+    def counting_to_xml(self, doc):
+        calls.append(self)
+        return to_xml(self, doc)
+
+    monkeypatch.setattr(LayerShortcut, 'to_xml', counting_to_xml)
+
+    return calls
+
+
+def shortcut_strs(elem):
+
+    child_nodes = elem.childNodes()
+    return [child_nodes.item(i).toElement().attribute('shortcut') for i in range(child_nodes.length())]
+
+
+def test_to_xml(table_model):
+
+    elem = table_model.to_xml(QDomDocument())
+
+    assert elem.tagName() == 'layer_shortcut'
+    assert shortcut_strs(elem) == ['Ctrl+Alt+1', 'Ctrl+Alt+2', 'Ctrl+Alt+3']
+
+
+def test_to_xml_reuses_cache(table_model, to_xml_calls):
+
+    table_model.to_xml(QDomDocument())
+    assert len(to_xml_calls) == 3
+
+    to_xml_calls.clear()
+    elem = table_model.to_xml(QDomDocument())
+
+    assert to_xml_calls == []
+    assert shortcut_strs(elem) == ['Ctrl+Alt+1', 'Ctrl+Alt+2', 'Ctrl+Alt+3']
+
+
+def test_to_xml_reserializes_changed_rows(table_model, to_xml_calls):
+
+    table_model.to_xml(QDomDocument())
+    to_xml_calls.clear()
+
+    changed = table_model.get_layer_shortcuts()[1]
+    changed.set_shortcut('Ctrl+Alt+9')
+
+    elem = table_model.to_xml(QDomDocument())
+
+    assert to_xml_calls == [changed]
+    assert shortcut_strs(elem) == ['Ctrl+Alt+1', 'Ctrl+Alt+9', 'Ctrl+Alt+3']
+
+
+def test_to_xml_after_remove(table_model, to_xml_calls):
+
+    table_model.to_xml(QDomDocument())
+    to_xml_calls.clear()
+
+    table_model.remove_layer_shortcut(table_model.get_layer_shortcuts()[0])
+
+    elem = table_model.to_xml(QDomDocument())
+
+    assert to_xml_calls == []
+    assert shortcut_strs(elem) == ['Ctrl+Alt+2', 'Ctrl+Alt+3']
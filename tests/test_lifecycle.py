@@ -0,0 +1,123 @@
+# Standard
+import pytest
+
+pytest.importorskip("qgis")
+
+# Project
+from quicklayers.layer_shortcut_table_model import LayerShortcutTableModel
+from quicklayers.quick_layers_widget import QuickLayersWidget
+from tests.lifecycle import bindings_elem, keyed_shortcuts, live_counts, process_deferred_deletes, rss_bytes
+
+# qgis
+from qgis.core import QgsProject
+from qgis.gui import QgsMapLayerComboBox
+
+# PyQt
+from qgis.PyQt.QtWidgets import QPushButton, QWidget
+
+N_BINDINGS = 10000
+# Every keyed row scans the existing shortcuts for conflicts, so loading is quadratic in
+# this number; benchmark_lifecycle times fully keyed loads
+N_KEYED = 1000
+N_CYCLES = 3
+MAX_RSS_GROWTH = 16 * 1024 * 1024
+
+
+def test_load_and_clear_bindings(map_lyr_names):
+
+    widget = QWidget()
+    table_model = LayerShortcutTableModel(parent=widget)
+    doc, elem = bindings_elem(N_BINDINGS, N_KEYED, map_lyr_names)
+
+    baseline = live_counts(widget, table_model)
+
+    # First cycle warms up caches and allocators
+    table_model.from_xml(elem)
+    table_model.clear_layer_shortcuts()
+    rss_start = rss_bytes()
+
+    for _ in range(N_CYCLES):
+        table_model.from_xml(elem)
+        counts = live_counts(widget, table_model)
+        assert counts['layer_shortcuts'] == baseline['layer_shortcuts'] + N_BINDINGS
+        assert counts['keyed_shortcuts'] == baseline['keyed_shortcuts'] + N_KEYED
+
+        # Teardown is synchronous: no event processing before counting
+        table_model.clear_layer_shortcuts()
+        assert live_counts(widget, table_model) == baseline
+
+    assert rss_bytes() - rss_start < MAX_RSS_GROWTH
+
+
+def test_reload_replaces_bindings(map_lyr_names):
+
+    widget = QWidget()
+    table_model = LayerShortcutTableModel(parent=widget)
+    doc, elem = bindings_elem(N_BINDINGS, N_KEYED, map_lyr_names)
+
+    baseline = live_counts(widget, table_model)
+
+    # from_xml clears the previous bindings itself, as on every project load
+    for _ in range(3):
+        table_model.from_xml(elem)
+
+    # Keys of the replaced bindings are released, otherwise reloading would report conflicts
+    counts = live_counts(widget, table_model)
+    assert counts['layer_shortcuts'] == baseline['layer_shortcuts'] + N_BINDINGS
+    assert counts['keyed_shortcuts'] == baseline['keyed_shortcuts'] + N_KEYED
+
+    table_model.clear_layer_shortcuts()
+    assert live_counts(widget, table_model) == baseline
+
+
+def test_removed_map_layer_is_released(map_lyr_names):
+
+    widget = QWidget()
+    table_model = LayerShortcutTableModel(parent=widget)
+    doc, elem = bindings_elem(len(map_lyr_names), len(map_lyr_names), map_lyr_names)
+
+    map_lyr = QgsProject.instance().mapLayersByName(map_lyr_names[0])[0]
+    baseline = (map_lyr.receivers(map_lyr.willBeDeleted), map_lyr.receivers(map_lyr.nameChanged))
+
+    table_model.from_xml(elem)
+    assert map_lyr.receivers(map_lyr.willBeDeleted) == baseline[0] + 1
+
+    table_model.clear_layer_shortcuts()
+    assert (map_lyr.receivers(map_lyr.willBeDeleted), map_lyr.receivers(map_lyr.nameChanged)) == baseline
+
+
+def test_widget_editors_and_clean_up(map_lyr_names):
+
+    widget = QuickLayersWidget()
+    doc, elem = bindings_elem(200, 200, map_lyr_names)
+
+    def editor_counts():
+        return (
+            len(widget.table_view.findChildren(QgsMapLayerComboBox)),
+            len(widget.table_view.findChildren(QPushButton)),
+        )
+
+    baseline = live_counts(widget, widget.table_model)
+    baseline_editors = editor_counts()
+
+    for _ in range(3):
+        widget.table_model.from_xml(elem)
+        assert live_counts(widget, widget.table_model)['keyed_shortcuts'] == baseline['keyed_shortcuts'] + 200
+
+        # Open an editor, as a click on a Layer cell does
+        layer_column = widget.table_model.header_labels.index("Layer")
+        widget.table_view.edit(widget.table_proxy_model.index(0, layer_column))
+
+        widget.table_model.clear_layer_shortcuts()
+
+        # Bindings are gone straight away, editors once deferred deletes run
+        assert live_counts(widget, widget.table_model) == baseline
+        process_deferred_deletes()
+        assert editor_counts() == baseline_editors
+
+    widget.clean_up()
+    widget.deleteLater()
+    process_deferred_deletes()
+
+    # Only the layer palette shortcut was left, and it goes with the widget
+    assert keyed_shortcuts() == baseline['keyed_shortcuts'] - 1
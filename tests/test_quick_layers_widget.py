@@ -0,0 +1,123 @@
+# Standard
+import time
+
+import pytest
+
+pytest.importorskip("qgis")
+
+# Project
+from quicklayers.quick_layers_widget import QuickLayersWidget
+from tests.benchmark_project_save import per_row_project_save, project_doc
+from tests.lifecycle import bindings_elem, process_deferred_deletes
+
+# qgis
+from qgis.gui import QgsMapLayerComboBox
+
+# PyQt
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.PyQt.QtWidgets import QPushButton
+
+N_BINDINGS = 10000
+MAX_KEYSTROKE_SECONDS = 0.5
+
+# Typing a layer name, then deleting it again
+KEYSTROKES = ['l', 'la', 'lay', 'laye', 'layer', 'layer_', 'layer_1', 'layer_', 'layer', 'lay', 'l', '']
+
+
+@pytest.fixture
+def widget(map_lyr_names):
+
+    widget = QuickLayersWidget()
+    widget.resize(400, 600)
+    widget.show()
+
+    yield widget
+
+    widget.clean_up()
+    widget.deleteLater()
+    process_deferred_deletes()
+
+
+def editor_count(widget) -> int:
+
+    return (
+        len(widget.table_view.findChildren(QgsMapLayerComboBox)) +
+        len(widget.table_view.findChildren(QPushButton))
+    )
+
+
+def test_filter_10k_rows(widget, map_lyr_names):
+
+    doc, elem = bindings_elem(N_BINDINGS, 0, map_lyr_names)
+    widget.table_model.from_xml(elem)
+    QCoreApplication.processEvents()
+
+    # Rows get no editors of their own
+    assert editor_count(widget) == 0
+
+    for text in KEYSTROKES:
+        start = time.perf_counter()
+        widget.filter_line_edit.setText(text)
+        QCoreApplication.processEvents()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < MAX_KEYSTROKE_SECONDS, f"Filtering on '{text}' took {elapsed:.3f} s"
+        assert editor_count(widget) == 0
+
+        if text == 'layer_1':
+            expected = sum(
+                layer_shortcut.map_lyr_name() == 'layer_1'
+                for layer_shortcut in widget.table_model.get_layer_shortcuts()
+            )
+            assert widget.table_proxy_model.rowCount() == expected
+
+    assert widget.table_proxy_model.rowCount() == N_BINDINGS
+
+
+def test_layer_cells_are_painted_from_model(widget, map_lyr_names):
+
+    doc, elem = bindings_elem(len(map_lyr_names) + 1, 0, map_lyr_names)
+    widget.table_model.from_xml(elem)
+
+    layer_column = widget.table_model.header_labels.index("Layer")
+    remove_column = widget.table_model.header_labels.index("Remove")
+
+    assert widget.table_proxy_model.index(0, layer_column).data() == map_lyr_names[0]
+    assert widget.table_proxy_model.index(len(map_lyr_names), layer_column).data() is None
+
+    # Remove cells are clicked, never edited
+    assert not widget.table_model.flags(widget.table_model.index(0, remove_column)) & 0x2
+
+
+def test_layer_editor_opens_on_edit(widget, map_lyr_names):
+
+    doc, elem = bindings_elem(3, 0, map_lyr_names)
+    widget.table_model.from_xml(elem)
+
+    layer_column = widget.table_model.header_labels.index("Layer")
+    widget.table_view.edit(widget.table_proxy_model.index(1, layer_column))
+
+    assert len(widget.table_view.findChildren(QgsMapLayerComboBox)) == 1
+
+
+def test_project_save_matches_per_row(widget, map_lyr_names):
+
+    doc, elem = bindings_elem(N_BINDINGS, 100, map_lyr_names)
+    widget.table_model.from_xml(elem)
+
+    def saved_xml(save):
+        doc = project_doc()
+        save(doc)
+        return doc.toString()
+
+    expected = saved_xml(lambda doc: per_row_project_save(widget, doc))
+
+    # Cold cache, then warm cache
+    assert saved_xml(widget.project_save) == expected
+    assert saved_xml(widget.project_save) == expected
+
+    # Rows changed after the cache was built
+    widget.table_model.get_layer_shortcuts()[1].set_shortcut('Ctrl+Alt+Shift+F12, Q')
+    widget.table_model.remove_layer_shortcut(widget.table_model.get_layer_shortcuts()[0])
+
+    assert saved_xml(widget.project_save) == saved_xml(lambda doc: per_row_project_save(widget, doc))